@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+LOOK-DGC Kernel Builder
+Compiles the Numba histogram kernels of gui/_hist_kernels.py ahead of time into
+gui/utility_kernels. The application picks the compiled module up automatically and
+uses it for single-pass colour histograms; without it, histograms use OpenCV/NumPy.
+"""
+
+import os
+import sys
+
+from numba.pycc import CC
+
+GUI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gui')
+sys.path.insert(0, GUI_DIR)
+
+import _hist_kernels  # noqa: E402
+
+cc = CC('utility_kernels')
+cc.output_dir = GUI_DIR
+cc.verbose = True
+
+# AOT code is always serial: prange runs as a plain range here
+cc.export('hist_u8', 'i8[:](u1[:], i8)')(_hist_kernels.hist_u8.py_func)
+cc.export('hist_bgr_u8', 'i8[:](u1[:, :], i8)')(_hist_kernels.hist_bgr_u8.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Compiled {cc.name} into {cc.output_dir}")
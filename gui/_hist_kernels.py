@@ -0,0 +1,34 @@
+# Source of the ahead-of-time utility_kernels module (see build_ext.py); utility never
+# JIT-compiles these at runtime
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def hist_u8(flat, chunks):
+        # One private 256-bin histogram per chunk, summed at the end
+        step = (flat.size + chunks - 1) // chunks
+        local = np.zeros((chunks, 256), np.int64)
+        for c in prange(chunks):
+            for i in range(c * step, min((c + 1) * step, flat.size)):
+                local[c, flat[i]] += 1
+        return local.sum(axis=0)
+
+    @njit(parallel=True, cache=True)
+    def hist_bgr_u8(pixels, chunks):
+        # Single pass over interleaved pixels, each channel counted into its own 256 bins
+        step = (pixels.shape[0] + chunks - 1) // chunks
+        local = np.zeros((chunks, 768), np.int64)
+        for c in prange(chunks):
+            for i in range(c * step, min((c + 1) * step, pixels.shape[0])):
+                local[c, pixels[i, 0]] += 1
+                local[c, 256 + pixels[i, 1]] += 1
+                local[c, 512 + pixels[i, 2]] += 1
+        return local.sum(axis=0)
+
@@ -0,0 +1,26 @@
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # Serial and nogil: callers already run one kernel per thread-pool worker
+    @njit(nogil=True, fastmath=True, cache=True)
+    def mean_absdiff_u8(a, b):
+        a = a.ravel()
+        b = b.ravel()
+        total = np.int64(0)
+        for i in range(a.size):
+            total += abs(np.int16(a[i]) - np.int16(b[i]))
+        return total / a.size
+
+
+def warm_up():
+    # Compile (or load from cache) before the first difference is taken
+    if NUMBA_AVAILABLE:
+        dummy = np.zeros((8, 8, 3), np.uint8)
+        mean_absdiff_u8(dummy, dummy)
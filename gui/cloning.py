@@ -1,6 +1,6 @@
 from itertools import compress
 from os.path import splitext
-from time import time
+from time import perf_counter_ns
 
 import cv2 as cv
 import numpy as np
@@ -175,7 +175,7 @@ class CloningWidget(ToolWidget):
         modify_font(self.status_label, bold=False, italic=False)
 
     def process(self):
-        start = time()
+        start = perf_counter_ns()
         self.canceled = False
         self.status_label.setText(self.tr("Processing, please wait..."))
         algorithm = self.detector_combo.currentIndex()
@@ -1,4 +1,4 @@
-from time import time
+from time import perf_counter_ns
 
 import cv2 as cv
 import numpy as np
@@ -50,7 +50,7 @@ class EchoWidget(ToolWidget):
         self.setLayout(main_layout)
 
     def process(self):
-        start = time()
+        start = perf_counter_ns()
         kernel = 2 * self.radius_spin.value() + 1
         contrast = int(self.contrast_spin.value() / 100 * 255)
         lut = create_lut(0, contrast)
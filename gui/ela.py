@@ -1,4 +1,4 @@
-from time import time
+from time import perf_counter_ns
 
 import cv2 as cv
 import numpy as np
@@ -76,7 +76,7 @@ class ElaWidget(ToolWidget):
         self.process()
 
     def process(self):
-        start = time()
+        start = perf_counter_ns()
         scale = self.scale_spin.value()
         contrast = int(self.contrast_spin.value() / 100 * 128)
         linear = self.linear_check.isChecked()
@@ -1,4 +1,4 @@
-from time import time
+from time import perf_counter_ns
 
 import cv2 as cv
 import numpy as np
@@ -107,7 +107,7 @@ class FrequencyWidget(ToolWidget):
         self.setLayout(main_layout)
 
     def process(self):
-        start = time()
+        start = perf_counter_ns()
         rows, cols, _ = self.dft.shape
         mask = np.zeros((rows, cols), np.float32)
         half = np.sqrt(rows ** 2 + cols ** 2) / 2
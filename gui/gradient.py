@@ -1,4 +1,4 @@
-from time import time
+from time import perf_counter_ns
 
 import cv2 as cv
 import numpy as np
@@ -63,7 +63,7 @@ class GradientWidget(ToolWidget):
         self.setLayout(main_layout)
 
     def process(self):
-        start = time()
+        start = perf_counter_ns()
         intensity = int(self.intensity_spin.value() / 100 * 127)
         invert = self.invert_check.isChecked()
         equalize = self.equalize_check.isChecked()
@@ -18,7 +18,7 @@ from matplotlib.backends.backend_qtagg import FigureCanvas
 from matplotlib.figure import Figure
 
 from tools import ToolWidget
-from utility import compute_hist, modify_font, ParamSlider, color_by_value
+from utility import compute_hist, compute_hist_bgr, modify_font, ParamSlider, color_by_value
 
 
 class HistWidget(ToolWidget):
@@ -45,9 +45,8 @@ class HistWidget(ToolWidget):
         self.start_slider = ParamSlider([0, 255], 8, 0, bold=True)
         self.end_slider = ParamSlider([0, 255], 8, 255, bold=True)
 
-        channels = list(cv.split(cv.cvtColor(image, cv.COLOR_BGR2RGB)))
-        channels.append(cv.cvtColor(image, cv.COLOR_BGR2GRAY))
-        self.hist = [compute_hist(c) for c in channels]
+        blue, green, red = compute_hist_bgr(image)
+        self.hist = [red, green, blue, compute_hist(cv.cvtColor(image, cv.COLOR_BGR2GRAY))]
         rows, cols, chans = image.shape
         pixels = rows * cols
         self.unique_colors = np.unique(
@@ -1,4 +1,4 @@
-from time import time
+from time import perf_counter_ns
 
 import cv2 as cv
 import numpy as np
@@ -113,7 +113,7 @@ class MinMaxWidget(ToolWidget):
         self.viewer.update_processed(self.image)
 
     def preprocess(self):
-        start = time()
+        start = perf_counter_ns()
         channel = self.chan_combo.currentIndex()
         if channel == 0:
             img = cv.cvtColor(self.image, cv.COLOR_BGR2GRAY)
@@ -168,7 +168,7 @@ class MinMaxWidget(ToolWidget):
         maximum = self.max_combo.currentIndex()
         radius = self.filter_spin.value()
         if radius > 0:
-            start = time()
+            start = perf_counter_ns()
             radius += 3
             if minimum < 4:
                 low = self.blk_filter(self.low, radius)
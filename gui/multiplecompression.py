@@ -1,18 +1,193 @@
-from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QPushButton
-from PySide6.QtCore import Signal
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QPushButton, QCheckBox
+from PySide6.QtCore import Qt, QThread, Signal
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 from PySide6.QtGui import QImage, QPixmap
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+
+try:
+    import simplejpeg
+    SIMPLEJPEG_AVAILABLE = True
+except ImportError:
+    SIMPLEJPEG_AVAILABLE = False
+
+
+_QUALITIES = (95, 90, 85, 80, 75, 70, 65, 60, 55, 50)
+_JPEG_PARAMS = {q: [int(cv2.IMWRITE_JPEG_QUALITY), q] for q in _QUALITIES}
+
+
+def encode(image, quality):
+    # Always encode through OpenCV: other encoders quantize differently at the same
+    # quality, which would shift the reported differences
+    params = _JPEG_PARAMS.get(quality) or [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+    _, encimg = cv2.imencode('.jpg', image, params)
+    return encimg
+
+
+def decode(encimg, dst=None):
+    # Decode through libjpeg-turbo directly when available, writing into dst if given
+    if SIMPLEJPEG_AVAILABLE:
+        return simplejpeg.decode_jpeg(encimg, colorspace='BGR', buffer=dst)
+    return cv2.imdecode(encimg, 1)
+
+
+# libjpeg-turbo and OpenCV release the GIL, so quality levels scale across threads
+_WORKERS = os.cpu_count() or 1
+_POOL = ThreadPoolExecutor(max_workers=_WORKERS)
+
+
+_diff_kernel = None
+_diff_kernel_lock = threading.Lock()
+
+
+def _numba_absdiff():
+    # numba is only imported (and the kernel compiled) once the fallback is needed,
+    # on the worker thread that needs it
+    global _diff_kernel
+    with _diff_kernel_lock:
+        if _diff_kernel is None:
+            import _mc_kernels
+
+            _mc_kernels.warm_up()
+            _diff_kernel = _mc_kernels.mean_absdiff_u8 if _mc_kernels.NUMBA_AVAILABLE else False
+    return _diff_kernel
+
+
+def mean_absdiff(a, b):
+    try:
+        # Single fused SAD pass (OpenCV's SSE/AVX2 backend uses _mm256_sad_epu8)
+        return cv2.norm(a, b, cv2.NORM_L1) / a.size
+    except cv2.error:
+        # Inputs OpenCV rejects go through the Numba kernel, or NumPy without it
+        kernel = _numba_absdiff()
+        if kernel:
+            return kernel(a, b)
+        return np.abs(a.astype(np.int16) - b).mean()
+
+
+def preview_crop(image, size):
+    # Centred window whose offsets stay on the 16x16 MCU grid (8x8 luma blocks plus
+    # 4:2:0 chroma): resampling would misalign the blocks and erase the dip at the
+    # original quality
+    rows, cols = image.shape[:2]
+    height = min(rows, size)
+    width = min(cols, size)
+    top = (rows - height) // 2 // 16 * 16
+    left = (cols - width) // 2 // 16 * 16
+    return np.ascontiguousarray(image[top : top + height, left : left + width])
+
+
+def gpu_sweep(image, qualities):
+    # Encode with the same OpenCV encoder as the CPU path (nvJPEG quantizes differently),
+    # then decode and diff with nvJPEG through torchvision: each bitstream is uploaded
+    # for decoding and only the final means are downloaded
+    import torch
+    from torchvision.io import decode_jpeg
+
+    if not torch.cuda.is_available():
+        raise RuntimeError("CUDA device not available")
+    rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    reference = torch.from_numpy(rgb).permute(2, 0, 1).cuda().to(torch.int16)
+    errors = []
+    for encimg in _POOL.map(lambda q: encode(image, q), qualities):
+        decoded = decode_jpeg(torch.from_numpy(encimg.ravel()), device="cuda")
+        errors.append((reference - decoded.to(torch.int16)).abs().float().mean())
+    return list(zip(qualities, torch.stack(errors).cpu().tolist()))
+
+
+class MultipleCompressionWorker(QThread):
+    result = Signal(list)
+    error = Signal(str)
+
+    def __init__(self, image, qualities, enc_cache, diff_cache, lock, gpu=False):
+        super().__init__()
+        self.image = image
+        self.qualities = qualities
+        self.gpu = gpu
+        self.used_gpu = False
+        self.enc_cache = enc_cache
+        self.diff_cache = diff_cache
+        self.lock = lock
+
+    def one_quality(self, quality, buffers):
+        key = (quality, self.image.shape)
+        encimg = self.enc_cache.get(key)
+        if encimg is None:
+            encimg = encode(self.image, quality)
+            with self.lock:
+                self.enc_cache[key] = encimg
+        # Borrow a decode buffer so no per-quality allocation is needed
+        decimg = buffers.get()
+        try:
+            decimg = decode(encimg, decimg)
+            diff = mean_absdiff(self.image, decimg)
+        finally:
+            buffers.put(decimg)
+        with self.lock:
+            self.diff_cache[key] = diff
+
+    def run(self):
+        if self.gpu:
+            try:
+                diffs = gpu_sweep(self.image, self.qualities)
+                self.used_gpu = True
+                self.result.emit(diffs)
+                return
+            except Exception as e:
+                self.error.emit(f"GPU unavailable, using CPU: {e}")
+        try:
+            shape = self.image.shape
+            missing = [q for q in self.qualities if (q, shape) not in self.diff_cache]
+            if missing:
+                buffers = queue.SimpleQueue()
+                for _ in range(min(len(missing), _WORKERS)):
+                    buffers.put(np.empty_like(self.image))
+                list(_POOL.map(lambda q: self.one_quality(q, buffers), missing))
+            self.result.emit([(q, self.diff_cache[(q, shape)]) for q in self.qualities])
+        except Exception as e:
+            self.error.emit(f"Multiple compression analysis failed: {e}")
+
+
+class HeatmapWorker(QThread):
+    result = Signal(object)
+    error = Signal(str)
+
+    def __init__(self, image, quality, enc_cache, lock):
+        super().__init__()
+        self.image = image
+        self.quality = quality
+        self.enc_cache = enc_cache
+        self.lock = lock
+
+    def run(self):
+        try:
+            key = (self.quality, self.image.shape)
+            encimg = self.enc_cache.get(key)
+            if encimg is None:
+                encimg = encode(self.image, self.quality)
+                with self.lock:
+                    self.enc_cache[key] = encimg
+            diff_img = cv2.absdiff(self.image, decode(encimg))
+            heatmap = cv2.applyColorMap(diff_img, cv2.COLORMAP_JET)
+            self.result.emit(np.ascontiguousarray(heatmap))
+        except Exception as e:
+            self.error.emit(f"Heatmap computation failed: {e}")
+
 
 class MultipleCompressionWidget(QWidget):
     info_message = Signal(str)
+    preview_size = 512
 
     def __init__(self, filename, image, parent=None):
         super().__init__(parent)
         self.filename = filename
+        self._cache_lock = threading.Lock()
         self.image = image
+        self.worker = None
 
         layout = QVBoxLayout()
         layout.addWidget(QLabel("Multiple Compression analysis"))
@@ -21,16 +196,33 @@ class MultipleCompressionWidget(QWidget):
         layout.addWidget(self.result_label)
 
         # Separate buttons for graph and heatmap
-        graph_button = QPushButton("Show Graph")
-        graph_button.clicked.connect(self.run_graph)
-        layout.addWidget(graph_button)
+        self.graph_button = QPushButton("Show Graph")
+        self.graph_button.clicked.connect(self.run_graph)
+        layout.addWidget(self.graph_button)
+
+        self.full_check = QCheckBox("Full resolution (slow)")
+        self.full_check.setToolTip(
+            f"Run the graph on the full image instead of a centred {self.preview_size} px crop"
+        )
+        layout.addWidget(self.full_check)
+
+        self.gpu_check = QCheckBox("Use GPU (CUDA)")
+        self.gpu_check.setToolTip(
+            "Decode the quality sweep with nvJPEG (requires PyTorch with CUDA); encoding "
+            "stays on OpenCV, but nvJPEG's decoder rounds differently, so values can "
+            "differ slightly from CPU ones"
+        )
+        layout.addWidget(self.gpu_check)
+
+        self.heatmap_button = QPushButton("Show Heatmap")
+        self.heatmap_button.clicked.connect(self.run_heatmap)
+        layout.addWidget(self.heatmap_button)
 
-        heatmap_button = QPushButton("Show Heatmap")
-        heatmap_button.clicked.connect(self.run_heatmap)
-        layout.addWidget(heatmap_button)
+        # Graph canvas (matplotlib is imported here so loading the module stays cheap)
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
 
-        # Graph canvas
-        self.figure = plt.Figure()
+        self.figure = Figure()
         self.canvas = FigureCanvas(self.figure)
         layout.addWidget(self.canvas)
 
@@ -41,35 +233,82 @@ class MultipleCompressionWidget(QWidget):
         self.setLayout(layout)
         self.info_message.emit("Detects multiple JPEG compressions")
 
+    @property
+    def image(self):
+        return self._image
+
+    @image.setter
+    def image(self, image):
+        # Encoded JPEGs and differences are only valid for the image they came from
+        with self._cache_lock:
+            self._image = image
+            # Canonical contiguous BGR8 view handed to every encoder; a no-op for
+            # loaded images, otherwise converted once here instead of on each encode
+            self._bgr = np.ascontiguousarray(image, dtype=np.uint8)
+            self._enc_cache = {}
+            self._diff_cache = {}
+            self._heatmap_pixmap = None
+
+    def set_busy(self, busy):
+        # Only one job at a time: both jobs share the caches and the worker slot
+        self.graph_button.setEnabled(not busy)
+        self.heatmap_button.setEnabled(not busy)
+
+    def start_worker(self, worker, on_result):
+        # QThread.finished fires on every exit, so the buttons come back even on errors
+        self.worker = worker
+        worker.result.connect(on_result)
+        worker.error.connect(self.info_message)
+        worker.finished.connect(lambda: self.set_busy(False))
+        worker.finished.connect(worker.deleteLater)
+        self.set_busy(True)
+        worker.start()
+
     def run_graph(self):
-        qualities = [95, 90, 85, 80, 75, 70, 65, 60, 55, 50]
-        diffs = []
-        for q in qualities:
-            _, encimg = cv2.imencode('.jpg', self.image, [int(cv2.IMWRITE_JPEG_QUALITY), q])
-            decimg = cv2.imdecode(encimg, 1)
-            diff = np.mean(cv2.absdiff(self.image, decimg))
-            diffs.append((q, diff))
+        image = self._bgr
+        if not self.full_check.isChecked():
+            # Encode cost is linear in pixels, so sweep a block-aligned crop
+            image = preview_crop(image, self.preview_size)
+        worker = MultipleCompressionWorker(
+            image,
+            _QUALITIES,
+            self._enc_cache,
+            self._diff_cache,
+            self._cache_lock,
+            gpu=self.gpu_check.isChecked(),
+        )
+        self.start_worker(worker, self.show_graph)
 
+    def show_graph(self, diffs):
         msg = f"Recompression diffs: {diffs}"
+        if self.worker is not None and self.worker.used_gpu:
+            msg += " (GPU decode: not directly comparable with CPU values)"
         self.info_message.emit(msg)
         self.result_label.setText(msg)
 
         # Update graph
         self.figure.clear()
         ax = self.figure.add_subplot(111)
-        qualities, values = zip(*diffs)
-        ax.plot(qualities, values, marker='o')
+        ax.plot(_QUALITIES, [diff for _, diff in diffs], marker='o')
         ax.set_xlabel("JPEG Quality")
         ax.set_ylabel("Difference")
         ax.set_title("Multiple Compression Analysis")
         self.canvas.draw()
 
     def run_heatmap(self):
+        if self._heatmap_pixmap is not None:
+            self.heatmap_label.setPixmap(self._heatmap_pixmap)
+            return
         # Pick one quality level (e.g., 70)
-        _, encimg = cv2.imencode('.jpg', self.image, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
-        decimg = cv2.imdecode(encimg, 1)
-        diff_img = cv2.absdiff(self.image, decimg)
-        heatmap = cv2.applyColorMap(diff_img, cv2.COLORMAP_JET)
-        h, w, ch = heatmap.shape
-        qimg = QImage(heatmap.data, w, h, ch * w, QImage.Format_BGR888)
-        self.heatmap_label.setPixmap(QPixmap.fromImage(qimg))
+        worker = HeatmapWorker(self._bgr, 70, self._enc_cache, self._cache_lock)
+        self.start_worker(worker, self.show_heatmap)
+
+    def show_heatmap(self, heatmap):
+        # QImage wraps this buffer without copying, so keep it alive on the widget
+        self._heatmap_np = heatmap
+        h, w = self._heatmap_np.shape[:2]
+        qimg = QImage(
+            self._heatmap_np.data, w, h, self._heatmap_np.strides[0], QImage.Format_BGR888
+        )
+        self._heatmap_pixmap = QPixmap.fromImage(qimg, Qt.NoFormatConversion)
+        self.heatmap_label.setPixmap(self._heatmap_pixmap)
@@ -1,4 +1,4 @@
-from time import time
+from time import perf_counter_ns
 
 import cv2 as cv
 from PySide6.QtWidgets import (
@@ -77,7 +77,7 @@ class NoiseWidget(ToolWidget):
         self.denoised_check.stateChanged.connect(self.process)
 
     def process(self):
-        start = time()
+        start = perf_counter_ns()
         grayscale = self.gray_check.isChecked()
         if grayscale:
             original = cv.cvtColor(self.image, cv.COLOR_BGR2GRAY)
@@ -1,4 +1,4 @@
-from time import time
+from time import perf_counter_ns
 
 import cv2 as cv
 import numpy as np
@@ -135,7 +135,7 @@ class PlotsWidget(ToolWidget):
         self.setLayout(main_layout)
 
     def redraw(self):
-        start = time()
+        start = perf_counter_ns()
         v = self.sampling_spin.value()
         x = self.colors[v][:, self.xaxis_combo.currentIndex()]
         y = self.colors[v][:, self.yaxis_combo.currentIndex()]
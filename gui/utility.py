@@ -1,6 +1,10 @@
 import os
 import sys
-from time import time
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from math import inf
+from time import perf_counter_ns
 
 try:
     import rawpy
@@ -8,6 +12,12 @@ try:
 except ImportError:
     RAWPY_AVAILABLE = False
 
+try:
+    # Ahead-of-time build of the histogram kernels (see build_ext.py)
+    import utility_kernels
+except ImportError:
+    utility_kernels = None
+
 import cv2 as cv
 import numpy as np
 from PySide6.QtCore import QSettings, QFileInfo, Signal, Qt, QMimeDatabase
@@ -24,21 +34,30 @@ from PySide6.QtWidgets import (
 )
 
 
+_QIMAGE_FORMATS = {
+    (1, np.dtype(np.uint8)): QImage.Format_Grayscale8,
+    (3, np.dtype(np.uint8)): QImage.Format_BGR888,
+    (4, np.dtype(np.uint8)): QImage.Format_ARGB32,
+}
+
+
 def mat2img(cvmat):
-    height, width, channels = cvmat.shape
-    return QImage(cvmat.data, width, height, 3 * width, QImage.Format_BGR888)
+    height, width = cvmat.shape[:2]
+    channels = 1 if cvmat.ndim == 2 else cvmat.shape[2]
+    fmt = _QIMAGE_FORMATS[(channels, cvmat.dtype)]
+    cvmat = np.ascontiguousarray(cvmat)
+    # Zero-copy: the QImage holds a reference to the array, which must not be
+    # modified while the image is in use
+    qimg = QImage(cvmat.data, width, height, cvmat.strides[0], fmt)
+    qimg._keepalive = cvmat
+    return qimg
+
+
+_VALUE_BRUSHES = tuple(QBrush(QColor.fromHsv(hue, 96, 255)) for hue in (0, 30, 60, 90))
 
 
 def color_by_value(item, value, splits):
-    if value < splits[0]:
-        hue = 0
-    elif value < splits[1]:
-        hue = 30
-    elif value < splits[2]:
-        hue = 60
-    else:
-        hue = 90
-    item.setBackground(QBrush(QColor.fromHsv(hue, 96, 255)))
+    item.setBackground(_VALUE_BRUSHES[bisect_right(splits, value, 0, 3)])
 
 
 def modify_font(obj, bold=False, italic=False, underline=False, mono=False):
@@ -63,8 +82,9 @@ def modify_font(obj, bold=False, italic=False, underline=False, mono=False):
 def pad_image(image, bsize, reflect=False):
     rows, cols = image.shape[:2]
     top = left = 0
-    bottom = bsize - rows % bsize
-    right = bsize - cols % bsize
+    # Round up to the next multiple; sizes already aligned are left unpadded
+    bottom = -rows % bsize
+    right = -cols % bsize
     border = cv.BORDER_CONSTANT if not reflect else cv.BORDER_REFLECT_101
     padded = cv.copyMakeBorder(image, top, bottom, left, right, border)
     return padded
@@ -72,8 +92,11 @@ def pad_image(image, bsize, reflect=False):
 
 def shift_image(image, bsize):
     rows, cols = image.shape[:2]
-    shifted = np.zeros_like(image)
+    # Only the uncovered bottom and right strips need zeroing
+    shifted = np.empty_like(image)
     shifted[: rows - bsize, : cols - bsize] = image[bsize:, bsize:]
+    shifted[rows - bsize :] = 0
+    shifted[:, cols - bsize :] = 0
     return shifted
 
 
@@ -102,20 +125,50 @@ def create_lut(low, high):
         p2 = (255, 255 + high)
     if p1[0] == p2[0]:
         return np.full(256, 255, np.uint8)
-    lut = [
-        (x * (p1[1] - p2[1]) + p1[0] * p2[1] - p1[1] * p2[0]) / (p1[0] - p2[0])
-        for x in range(256)
-    ]
-    return np.clip(np.array(lut), 0, 255).astype(np.uint8)
+    x = np.arange(256)
+    lut = (x * (p1[1] - p2[1]) + p1[0] * p2[1] - p1[1] * p2[0]) / (p1[0] - p2[0])
+    return np.minimum(np.maximum(lut, 0), 255).astype(np.uint8)
+
+
+# Ahead-of-time kernels only: compiling numba on first use would stall the GUI thread,
+# and calcHist/bincount already cover every size without it. The AOT code is serial,
+# so single planes only use it where calcHist stops being exact
+_hist_backend = utility_kernels
+
+
+# calcHist only pays off past small blocks, and counts in float32 (exact below 2**24)
+_HIST_CALC_SIZE = (1 << 12, 1 << 24)
+_hist_local = threading.local()
 
 
 def compute_hist(image, normalize=False):
-    hist = np.array(
-        [h[0] for h in cv.calcHist([image], [0], None, [256], [0, 256])], int
-    )
+    if image.ndim > 2:
+        image = image[:, :, 0]
+    uint8 = image.dtype == np.uint8
+    if not uint8 or _HIST_CALC_SIZE[0] <= image.size < _HIST_CALC_SIZE[1]:
+        # Other depths also go here to keep the fixed 256 bins over [0, 256);
+        # one output buffer per thread, reused across calls
+        buffer = getattr(_hist_local, "buffer", None)
+        if buffer is None:
+            buffer = _hist_local.buffer = np.empty((256, 1), np.float32)
+        cv.calcHist([image], [0], None, [256], [0, 256], hist=buffer, accumulate=False)
+        hist = buffer.ravel().astype(int)
+    elif _hist_backend is not None and image.size >= _HIST_CALC_SIZE[1]:
+        hist = _hist_backend.hist_u8(image.ravel(), 1).astype(int, copy=False)
+    else:
+        hist = np.bincount(image.ravel(), minlength=256).astype(int, copy=False)
     return hist / image.size if normalize else hist
 
 
+def compute_hist_bgr(image):
+    if _hist_backend is not None and image.dtype == np.uint8:
+        # One pass over the interleaved pixels beats splitting and counting each plane
+        hist = _hist_backend.hist_bgr_u8(image.reshape(-1, 3), 1).astype(int, copy=False)
+        return hist[:256], hist[256:512], hist[512:]
+    # No kernel module (or not uint8): one calcHist/bincount per plane
+    return tuple(compute_hist(c) for c in cv.split(image))
+
+
 def auto_lut(image, centile):
     hist = compute_hist(image, normalize=True)
     if centile == 0:
@@ -123,27 +176,20 @@ def auto_lut(image, centile):
         low = nonzero[0]
         high = nonzero[-1]
     else:
-        low_sum = high_sum = 0
-        low = 0
-        high = 255
-        for i, h in enumerate(hist):
-            low_sum += h
-            if low_sum >= centile:
-                low = i
-                break
-        for i, h in enumerate(np.flip(hist)):
-            high_sum += h
-            if high_sum >= centile:
-                high = i
-                break
+        # First bin where the cumulative share from either end reaches centile
+        low = np.searchsorted(np.cumsum(hist), centile)
+        high = np.searchsorted(np.cumsum(hist[::-1]), centile)
+        low = low if low < 256 else 0
+        high = high if high < 256 else 255
     return create_lut(low, high)
 
 
 def elapsed_time(start, ms=True):
-    elapsed = time() - start
+    # start is a perf_counter_ns() reading
+    elapsed = perf_counter_ns() - start
     if ms:
-        return f"{int(np.round(elapsed * 1000))} ms"
-    return f"{elapsed:.2f} sec"
+        return f"{(elapsed + 500_000) // 1_000_000} ms"
+    return f"{elapsed / 1e9:.2f} sec"
 
 
 def signed_value(value):
@@ -151,19 +197,32 @@ def signed_value(value):
 
 
 def equalize_img(image):
+    # Channels are equalized independently on purpose: several tools feed maps whose
+    # channels are not color (gradients, PCA components) through here
+    if image.ndim == 2:
+        return cv.equalizeHist(image)
     return cv.merge([cv.equalizeHist(c) for c in cv.split(image)])
 
 
 def norm_img(image):
+    # Stretched per channel, unlike a single cv.normalize over the whole image
     return cv.merge([norm_mat(c) for c in cv.split(image)])
 
 
-def clip_value(value, minv=None, maxv=None):
-    if minv is not None:
-        value = max(value, minv)
-    if maxv is not None:
-        value = min(value, maxv)
-    return value
+@lru_cache(maxsize=32)
+def _norm_lut(mean, std):
+    lut = (np.arange(256, dtype=np.float32) - np.float32(mean)) / np.float32(std)
+    lut.flags.writeable = False
+    return lut
+
+
+def norm_img_lut(image, mean, std):
+    # Same as (image.astype(np.float32) - mean) / std for uint8 input, as a table lookup
+    return cv.LUT(image, _norm_lut(float(mean), float(std)))
+
+
+def clip_value(value, minv=-inf, maxv=inf):
+    return minv if value < minv else maxv if value > maxv else value
 
 
 def bgr_to_gray3(image):
@@ -273,11 +332,11 @@ def load_image(parent, filename=None):
 
 
 def desaturate(image):
-    return cv.cvtColor(cv.cvtColor(image, cv.COLOR_BGR2GRAY), cv.COLOR_GRAY2BGR)
+    return bgr_to_gray3(image)
 
 
 def norm_mat(matrix, to_bgr=False):
-    norm = cv.normalize(matrix, None, 0, 255, cv.NORM_MINMAX).astype(np.uint8)
+    norm = cv.normalize(matrix, None, 0, 255, cv.NORM_MINMAX, cv.CV_8U)
     if not to_bgr:
         return norm
     return cv.cvtColor(norm, cv.COLOR_GRAY2BGR)
@@ -8,18 +8,49 @@ Project: LOOK-DGC - Digital Image Forensics Toolkit
 import sys
 import os
 import subprocess
+import json
+import time
+import re
 import socket
+import importlib.metadata
 import importlib.util
 
-def check_internet():
-    """Check if internet connection is available"""
+NET_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "look_dgc_net.json")
+NET_CACHE_TTL = 60
+
+def probe_host(address, timeout):
+    """Try a TCP connection to address within timeout seconds"""
     try:
-        socket.create_connection(("8.8.8.8", 53), timeout=3)
-        return True
+        with socket.create_connection(address, timeout=timeout):
+            return True
     except OSError:
         return False
 
-def check_dependencies():
+def check_internet():
+    """Check if internet connection is available (result cached for NET_CACHE_TTL seconds)"""
+    try:
+        with open(NET_CACHE) as f:
+            cached = json.load(f)
+        if time.time() - cached["t"] < NET_CACHE_TTL:
+            return cached["online"]
+        first_run = False
+    except (OSError, ValueError, KeyError, TypeError):
+        first_run = True
+    
+    # A short probe settles the common case; only wait the full 3 s the first time
+    online = probe_host(("1.1.1.1", 53), 0.5)
+    if not online and first_run:
+        online = probe_host(("8.8.8.8", 53), 3)
+    
+    try:
+        os.makedirs(os.path.dirname(NET_CACHE), exist_ok=True)
+        with open(NET_CACHE, "w") as f:
+            json.dump({"t": time.time(), "online": online}, f)
+    except OSError:
+        pass
+    return online
+
+def check_dependencies(check_tf=False):
     """Check if all required Python dependencies are installed using the validator"""
     try:
         # Try to import the validator
@@ -29,12 +60,16 @@ def check_dependencies():
             return validate_deps.validate_dependencies(detailed=True)
         else:
             # Fallback to basic checking
-            return check_dependencies_basic()
+            return check_dependencies_basic(check_tf)
     except ImportError:
         # Fallback to basic checking if validator can't be imported
-        return check_dependencies_basic()
+        return check_dependencies_basic(check_tf)
 
-def check_dependencies_basic():
+def normalize_name(name):
+    """Normalize a distribution name for comparison (PEP 503)"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def check_dependencies_basic(check_tf=False):
     """Basic dependency checking as fallback"""
     print("Checking Python dependencies...")
     
@@ -58,25 +93,39 @@ def check_dependencies_basic():
         'xgboost': 'xgboost'
     }
     
-    # Try to import tensorflow (optional but important for some features)
-    try:
-        import tensorflow as tf
-        tensorflow_available = True
+    # TensorFlow is optional but important for some features; importing it takes
+    # several seconds, so only do it on request (--check-tf)
+    if check_tf:
+        try:
+            import tensorflow as tf
+            tensorflow_available = True
+        except ImportError:
+            tensorflow_available = False
+    else:
+        tensorflow_available = importlib.util.find_spec('tensorflow') is not None
+    if tensorflow_available:
         print("✓ TensorFlow available")
-    except ImportError:
-        tensorflow_available = False
+    else:
         print("⚠ TensorFlow not found - some advanced features will be disabled")
     
     missing_packages = []
     available_packages = []
     
+    # Read installed distribution metadata instead of importing each package
+    installed = {
+        normalize_name(dist.metadata['Name'])
+        for dist in importlib.metadata.distributions()
+        if dist.metadata['Name']
+    }
+    
     for package_name, import_name in required_packages.items():
-        try:
-            # Try to import the module
-            importlib.import_module(import_name)
+        # Locate the module without executing it when the package was installed
+        # under a different distribution name (e.g. opencv-python)
+        if (normalize_name(package_name) in installed
+                or importlib.util.find_spec(import_name) is not None):
             available_packages.append(package_name)
             print(f"✓ {package_name}")
-        except ImportError:
+        else:
             missing_packages.append(package_name)
             print(f"✗ {package_name} (missing)")
     
@@ -125,7 +174,7 @@ def main():
         return
     
     # Check dependencies before proceeding
-    deps_ok, available, missing = check_dependencies()
+    deps_ok, available, missing = check_dependencies(check_tf='--check-tf' in sys.argv)
     if not deps_ok:
         print("\n⚠ Cannot launch LOOK-DGC due to missing dependencies.")
         choice = input("\nWould you like to try launching anyway? (y/N): ").strip().lower()
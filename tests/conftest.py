@@ -11,31 +11,37 @@ import numpy as np
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'gui'))
 
 # Test image fixtures
-@pytest.fixture
+# Image fixtures are built once per session; tests that modify them must work on a .copy()
+@pytest.fixture(scope="session")
 def sample_image():
     """Create a simple test image"""
     # Create a 100x100 RGB image with a gradient
-    image = np.zeros((100, 100, 3), dtype=np.uint8)
-    for i in range(100):
-        for j in range(100):
-            image[i, j] = [i * 2, j * 2, (i + j)]
+    i, j = np.mgrid[0:100, 0:100]
+    image = np.stack([i * 2, j * 2, i + j], axis=-1).astype(np.uint8)
     return image
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_grayscale_image():
     """Create a simple grayscale test image"""
-    image = np.zeros((100, 100), dtype=np.uint8)
-    for i in range(100):
-        for j in range(100):
-            image[i, j] = (i + j) % 256
+    i, j = np.ogrid[0:100, 0:100]
+    image = ((i + j) % 256).astype(np.uint8)
     return image
 
-@pytest.fixture
-def sample_image_path(tmp_path):
+@pytest.fixture(scope="session")
+def sample_noise_image():
+    """Create a deterministic random noise test image"""
+    return np.random.default_rng(0).integers(0, 255, (100, 100, 3), dtype=np.uint8)
+
+@pytest.fixture(scope="session")
+def sample_image_bytes(sample_noise_image):
+    """Encode the noise test image as in-memory JPEG bytes"""
+    return cv.imencode(".jpg", sample_noise_image)[1].tobytes()
+
+@pytest.fixture(scope="session")
+def sample_image_path(tmp_path_factory, sample_image_bytes):
     """Create a temporary image file for testing"""
-    image = np.random.randint(0, 255, (100, 100, 3), dtype=np.uint8)
-    file_path = tmp_path / "test_image.jpg"
-    cv.imwrite(str(file_path), image)
+    file_path = tmp_path_factory.mktemp("images") / "test_image.jpg"
+    file_path.write_bytes(sample_image_bytes)
     return str(file_path)
 
 @pytest.fixture
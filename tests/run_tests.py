@@ -10,54 +10,54 @@ import argparse
 import subprocess
 
 def run_command(cmd, cwd=None):
-    """Run a command and return the result"""
+    """Run a command (argument list), streaming its output, and return the result"""
     try:
-        result = subprocess.run(cmd, shell=True, cwd=cwd, 
-                              capture_output=True, text=True, check=True)
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr, file=sys.stderr)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error running command: {cmd}")
-        print(f"Return code: {e.returncode}")
-        if e.stdout:
-            print(f"stdout: {e.stdout}")
-        if e.stderr:
-            print(f"stderr: {e.stderr}")
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, bufsize=1, text=True)
+    except OSError as e:
+        print(f"Error running command: {' '.join(cmd)}")
+        print(e)
         return False
+    for line in proc.stdout:
+        sys.stdout.write(line)
+    returncode = proc.wait()
+    if returncode != 0:
+        print(f"Error running command: {' '.join(cmd)}")
+        print(f"Return code: {returncode}")
+    return returncode == 0
 
 def install_test_deps():
     """Install test dependencies"""
     print("Installing test dependencies...")
-    return run_command("pip install -r test_requirements.txt", cwd="tests")
+    return run_command([sys.executable, "-m", "pip", "install", "-r", "test_requirements.txt"],
+                       cwd="tests")
 
 def run_unit_tests(verbose=False, coverage=False):
     """Run unit tests"""
     print("Running unit tests...")
-    cmd = "python -m pytest unit/"
+    cmd = [sys.executable, "-m", "pytest", "unit/"]
     if verbose:
-        cmd += " -v"
+        cmd.append("-v")
     if coverage:
-        cmd += " --cov=../gui --cov-report=html --cov-report=term"
+        cmd += ["--cov=../gui", "--cov-report=html", "--cov-report=term"]
     return run_command(cmd, cwd="tests")
 
 def run_integration_tests(verbose=False):
     """Run integration tests"""
     print("Running integration tests...")
-    cmd = "python -m pytest integration/"
+    cmd = [sys.executable, "-m", "pytest", "integration/"]
     if verbose:
-        cmd += " -v"
+        cmd.append("-v")
     return run_command(cmd, cwd="tests")
 
 def run_all_tests(verbose=False, coverage=False):
     """Run all tests"""
     print("Running all tests...")
-    cmd = "python -m pytest"
+    cmd = [sys.executable, "-m", "pytest"]
     if verbose:
-        cmd += " -v"
+        cmd.append("-v")
     if coverage:
-        cmd += " --cov=../gui --cov-report=html --cov-report=term"
+        cmd += ["--cov=../gui", "--cov-report=html", "--cov-report=term"]
     return run_command(cmd, cwd="tests")
 
 def main():
@@ -0,0 +1,135 @@
+"""
+Unit tests for multiplecompression.py
+"""
+import os
+import subprocess
+import sys
+import threading
+import numpy as np
+import cv2
+import pytest
+from unittest.mock import patch
+
+import multiplecompression
+
+from multiplecompression import (
+    _QUALITIES, encode, decode, mean_absdiff, preview_crop,
+    MultipleCompressionWorker, MultipleCompressionWidget
+)
+
+def reference_diffs(image, qualities):
+    """Original per-quality loop the refactored helpers must reproduce"""
+    diffs = []
+    for q in qualities:
+        _, encimg = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), q])
+        decimg = cv2.imdecode(encimg, 1)
+        diffs.append((q, np.mean(cv2.absdiff(image, decimg))))
+    return diffs
+
+def test_round_trip_matches_reference(sample_noise_image):
+    """Test encode/decode/mean_absdiff against the original loop"""
+    for q, expected in reference_diffs(sample_noise_image, _QUALITIES):
+        decimg = decode(encode(sample_noise_image, q))
+        assert decimg.shape == sample_noise_image.shape
+        assert mean_absdiff(sample_noise_image, decimg) == pytest.approx(expected)
+
+def test_mean_absdiff_fallback(sample_noise_image):
+    """Test inputs OpenCV rejects still get the same difference"""
+    decimg = decode(encode(sample_noise_image, 75))
+    expected = np.mean(cv2.absdiff(sample_noise_image, decimg))
+    with patch("multiplecompression.cv2.norm", side_effect=cv2.error):
+        assert mean_absdiff(sample_noise_image, decimg) == pytest.approx(expected)
+
+def test_import_keeps_numba_unloaded():
+    """Test loading the module does not import numba"""
+    code = "import sys, multiplecompression; print('numba' in sys.modules)"
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(multiplecompression.__file__),
+        capture_output=True, text=True, check=True,
+    )
+    assert out.stdout.strip() == "False"
+
+def test_decode_into_buffer(sample_noise_image):
+    """Test decoding into a preallocated buffer gives the same pixels"""
+    encimg = encode(sample_noise_image, 75)
+    buffer = np.empty_like(sample_noise_image)
+    assert np.array_equal(decode(encimg, buffer), decode(encimg))
+
+def test_worker_returns_all_qualities(sample_noise_image):
+    """Test the worker reports every quality, in order"""
+    worker = MultipleCompressionWorker(
+        sample_noise_image, _QUALITIES, {}, {}, threading.Lock()
+    )
+    results = []
+    worker.result.connect(results.append)
+    worker.run()
+    assert len(results) == 1
+    assert [q for q, _ in results[0]] == list(_QUALITIES)
+    expected = reference_diffs(sample_noise_image, _QUALITIES)
+    assert [d for _, d in results[0]] == pytest.approx([d for _, d in expected])
+
+def test_gpu_worker_falls_back_to_cpu(sample_noise_image):
+    """Test a GPU sweep without torch/CUDA reports it and returns the CPU results"""
+    worker = MultipleCompressionWorker(
+        sample_noise_image, _QUALITIES, {}, {}, threading.Lock(), gpu=True
+    )
+    results, errors = [], []
+    worker.result.connect(results.append)
+    worker.error.connect(errors.append)
+    with patch.dict(sys.modules, {"torch": None}):
+        worker.run()
+    assert len(errors) == 1 and errors[0].startswith("GPU unavailable")
+    assert not worker.used_gpu
+    assert len(results) == 1
+    expected = reference_diffs(sample_noise_image, _QUALITIES)
+    assert [q for q, _ in results[0]] == list(_QUALITIES)
+    assert [d for _, d in results[0]] == pytest.approx([d for _, d in expected])
+
+def test_preview_keeps_original_quality_dip():
+    """Test the preview crop still shows the dip at the original JPEG quality"""
+    rng = np.random.default_rng(0)
+    texture = rng.integers(0, 256, (150, 200, 3), dtype=np.uint8)
+    image = cv2.resize(texture, (1600, 1200), interpolation=cv2.INTER_CUBIC)
+    evidence = decode(encode(image, 75))
+    preview = preview_crop(evidence, 512)
+    assert preview.shape == (512, 512, 3)
+    diffs = dict(
+        (q, mean_absdiff(preview, decode(encode(preview, q)))) for q in _QUALITIES
+    )
+    assert diffs[75] < diffs[80] and diffs[75] < diffs[70]
+
+def test_image_setter_clears_caches(mock_qt_app, sample_noise_image):
+    """Test assigning a new image invalidates every cache"""
+    widget = MultipleCompressionWidget("test.jpg", sample_noise_image)
+    widget._enc_cache[(75, sample_noise_image.shape)] = b"stale"
+    widget._diff_cache[(75, sample_noise_image.shape)] = 1.0
+    widget._heatmap_pixmap = object()
+    widget.image = sample_noise_image.copy()
+    assert widget._enc_cache == {}
+    assert widget._diff_cache == {}
+    assert widget._heatmap_pixmap is None
+
+def test_worker_reports_errors(sample_noise_image):
+    """Test a failing sweep emits an error instead of raising out of the thread"""
+    worker = MultipleCompressionWorker(
+        sample_noise_image, _QUALITIES, {}, {}, threading.Lock()
+    )
+    results, errors = [], []
+    worker.result.connect(results.append)
+    worker.error.connect(errors.append)
+    with patch("multiplecompression.encode", side_effect=MemoryError):
+        worker.run()
+    assert results == []
+    assert len(errors) == 1
+
+def test_buttons_reenabled_after_error(mock_qt_app, qtbot, sample_noise_image):
+    """Test the busy state is cleared when a job fails"""
+    widget = MultipleCompressionWidget("test.jpg", sample_noise_image)
+    with patch("multiplecompression.encode", side_effect=MemoryError):
+        widget.run_graph()
+        assert not widget.graph_button.isEnabled()
+        qtbot.waitUntil(widget.graph_button.isEnabled, timeout=5000)
+        widget.run_heatmap()
+        qtbot.waitUntil(widget.heatmap_button.isEnabled, timeout=5000)
+    assert widget._heatmap_pixmap is None
@@ -7,11 +7,15 @@ This script provides detailed information about missing dependencies and install
 
 import sys
 import os
+import functools
+import importlib.metadata
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple
 
+@functools.lru_cache(maxsize=1)
 def get_required_packages() -> Dict[str, str]:
-    """Return dictionary of required packages and their import names"""
+    """Return dictionary of required packages and their import names (cached, do not modify)"""
     return {
         'PySide6': 'PySide6',
         'opencv-contrib-python-headless': 'cv2',
@@ -33,25 +37,31 @@ def get_required_packages() -> Dict[str, str]:
 
 def check_package(package_name: str, import_name: str) -> Tuple[bool, str]:
     """
-    Check if a package can be imported.
+    Check if a package can be imported, without executing it.
     
     Returns:
         Tuple[bool, str]: (is_available, status_message)
     """
     try:
-        importlib.import_module(import_name)
-        return True, f"✓ {package_name} is available"
-    except ImportError as e:
+        spec = importlib.util.find_spec(import_name)
+    except (ImportError, ValueError) as e:
         return False, f"✗ {package_name} is missing: {str(e)}"
+    if spec is None:
+        return False, f"✗ {package_name} is missing: No module named '{import_name}'"
+    return True, f"✓ {package_name} is available"
 
 def check_tensorflow() -> Tuple[bool, str]:
     """Check TensorFlow availability (optional but recommended)"""
+    # Importing TensorFlow takes seconds; the version comes from its metadata instead
+    if importlib.util.find_spec('tensorflow') is None:
+        return False, "⚠ TensorFlow not found - some advanced features will be disabled"
     try:
+        version = importlib.metadata.version('tensorflow')
+    except importlib.metadata.PackageNotFoundError:
+        # Installed under another distribution name (tensorflow-cpu, tf-nightly, ...)
         import tensorflow as tf
         version = tf.__version__
-        return True, f"✓ TensorFlow {version} is available"
-    except ImportError:
-        return False, "⚠ TensorFlow not found - some advanced features will be disabled"
+    return True, f"✓ TensorFlow {version} is available"
 
 def validate_dependencies(detailed: bool = True) -> Tuple[bool, List[str], List[str]]:
     """
@@ -80,8 +90,12 @@ def validate_dependencies(detailed: bool = True) -> Tuple[bool, List[str], List[
     if detailed:
         print("\n📦 Required packages:")
     
-    for package_name, import_name in required_packages.items():
-        is_available, message = check_package(package_name, import_name)
+    # Lookups are mostly filesystem stats, so run them concurrently;
+    # map keeps the results in the declared order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(check_package, required_packages.keys(), required_packages.values()))
+    
+    for package_name, (is_available, message) in zip(required_packages, results):
         if detailed:
             print(f"  {message}")
         